@@ -0,0 +1,82 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, initializedcheck=False
+"""
+Optional compiled keyword scan for log_analyser, built with setup.py.
+The transition table comes from log_analyser.build_scan_table.
+"""
+from libc.string cimport memchr
+
+
+def scan(const unsigned char[::1] buffer, Py_ssize_t pos, Py_ssize_t end,
+         const unsigned int[::1] transitions, const unsigned char[::1] accepting, long long[::1] out):
+    """
+    Scans buffer[pos:end] line by line, stepping the Aho-Corasick table once per byte.
+    Writes the start of each matching line into out until it is full.
+    Returns (pos, found) so the caller can resume where the scan stopped.
+    """
+    cdef const unsigned char* base
+    cdef const unsigned char* newline
+    cdef Py_ssize_t capacity = out.shape[0]
+    cdef Py_ssize_t found = 0
+    cdef Py_ssize_t line_end, i
+    cdef unsigned int state
+    cdef bint matched
+
+    if pos >= end:
+        return pos, 0
+    base = &buffer[0]
+
+    with nogil:
+        while pos < end and found < capacity:
+            newline = <const unsigned char*>memchr(base + pos, b'\n', end - pos)
+            line_end = end if newline == NULL else newline - base
+
+            state = 0
+            matched = accepting[0]
+            i = pos
+            while not matched and i < line_end:
+                state = transitions[(state << 8) | base[i]]
+                matched = accepting[state]
+                i += 1
+
+            if matched:
+                out[found] = pos
+                found += 1
+            pos = line_end + 1
+
+    return pos, found
+
+
+def count(const unsigned char[::1] buffer, Py_ssize_t pos, Py_ssize_t end,
+          const unsigned int[::1] transitions, const unsigned char[::1] accepting):
+    """
+    Counts the lines in buffer[pos:end] that match, for count only runs.
+    Works like scan but records nothing, so the whole range is covered in one call.
+    """
+    cdef const unsigned char* base
+    cdef const unsigned char* newline
+    cdef Py_ssize_t line_end, i
+    cdef Py_ssize_t matched_lines = 0
+    cdef unsigned int state
+    cdef bint matched
+
+    if pos >= end:
+        return 0
+    base = &buffer[0]
+
+    with nogil:
+        while pos < end:
+            newline = <const unsigned char*>memchr(base + pos, b'\n', end - pos)
+            line_end = end if newline == NULL else newline - base
+
+            state = 0
+            matched = accepting[0]
+            i = pos
+            while not matched and i < line_end:
+                state = transitions[(state << 8) | base[i]]
+                matched = accepting[state]
+                i += 1
+
+            matched_lines += matched
+            pos = line_end + 1
+
+    return matched_lines
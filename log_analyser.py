@@ -1,6 +1,22 @@
 import argparse
 import sys
 import os
+import stat
+import re
+import mmap
+from array import array
+from collections import deque
+from multiprocessing import Pool
+
+try: # Optional dependency, vectorised multi-pattern matching for large keyword sets.
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try: # Optional compiled scanner, built with setup.py. Falls back to searching lowered chunks.
+    import _filter
+except ImportError:
+    _filter = None
 
 class Colours:
     RESET = "\033[0m"
@@ -28,6 +44,13 @@ class Colours:
     BG_CYAN = "\033[46m"
     BG_WHITE = "\033[47m"
 
+    # Screen control, clears the screen and moves the cursor home
+    CLEAR_SCREEN = "\033[2J\033[H"
+
+    # Byte forms for writing straight to binary streams
+    RESET_B = RESET.encode()
+    DIM_B = DIM.encode()
+
     # Helper function to apply color and reset
     @staticmethod
     def apply(text, color_code):
@@ -36,15 +59,20 @@ class Colours:
 class LogEntry:
     """
     Represents a single log entry.
-    Currently stores the raw line and the line number.
+    Currently stores the raw line (as undecoded bytes) and the line number.
     """
+    # One is built per line, so skip the per-instance __dict__.
+    __slots__ = ('raw_line', 'line_number')
     
     def __init__(self, raw_line, line_number):
-        self.raw_line = raw_line.strip()
+        self.raw_line = raw_line
         self.line_number = line_number
         
+    def __bytes__(self):
+        return b" %d :: %s" % (self.line_number, self.raw_line)
+    
     def __str__(self):
-        return f" {self.line_number} :: {self.raw_line}"
+        return bytes(self).decode('utf-8', errors='ignore')
     
     def __repr__(self):
         return f"LogEntry(line_number={self.line_number}, raw_line={self.raw_line[:50]}...)"
@@ -59,59 +87,348 @@ class LogReader:
     def __repr__(self):
         return f"ReadLog(file_path={self.file_path})"
     
-    def read_lines(self):
+    def check_file(self):
         """
-        Generates LogEntry objects from the file line by line.
-        Handles FileNotFoundErrors and General I/O errors.
+        Checks the log file exists and is a regular file with a single stat call.
+        Raises FileNotFoundError or IOError otherwise, read permission is left to _open.
+        Returns the file's size in bytes.
         """
         
-        if not os.path.exists(self.file_path): # Handles file not existing.
+        try:
+            file_stat = os.stat(self.file_path)
+        except FileNotFoundError: # Handles file not existing.
             raise FileNotFoundError(f"The file {self.file_path} does not exist.")
+        except PermissionError: # Handles a parent directory that cannot be searched.
+            raise PermissionError(f"Permission not granted to read {self.file_path}.")
         
-        if not os.path.isfile(self.file_path): # Handles path not being a file.
+        if not stat.S_ISREG(file_stat.st_mode): # Handles path not being a file.
             raise IOError(f"The file {self.file_path} is not a file.")
-        
-        if not os.access(self.file_path, os.R_OK): # Handles permission not being granted.
+        return file_stat.st_size
+    
+    def _open(self):
+        """
+        Opens the log file in binary mode, raising PermissionError if it cannot be read.
+        """
+        try:
+            return open(self.file_path, 'rb')
+        except PermissionError: # Handles permission not being granted.
             raise PermissionError(f"Permission not granted to read {self.file_path}.")
+    
+    def _map(self, file):
+        """
+        Maps an open file read-only, returning None if it is empty or cannot be mapped.
+        """
+        if os.fstat(file.fileno()).st_size == 0: # mmap cannot map an empty file.
+            return None
+        
+        try:
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError): # Handles filesystems that do not support mapping.
+            return None
+        
+        if hasattr(mmap, 'MADV_SEQUENTIAL'): # Not available on Windows.
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return mm
+    
+    def read_chunks(self):
+        """
+        Generates the file's bytes in chunks of whole lines, about CHUNK_SIZE each.
+        Files that cannot be mapped are read CHUNK_SIZE bytes at a time, so they are never held in memory whole.
+        """
+        with self._open() as file:
+            mm = self._map(file)
+            if mm is None:
+                yield from stream_chunks(file)
+                return
+            
+            with mm:
+                yield from iter_chunks(mm, 0, len(mm))
+    
+    def read_lines(self):
+        """
+        Generates (line number, raw line bytes) tuples from the file line by line.
+        LogEntry objects are left to the caller, so lines that get filtered out cost no object.
+        Handles FileNotFoundErrors and General I/O errors.
+        """
+        
+        self.check_file()
         
         try: # Handles reading all lines.
-            with open(self.file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                for line_num, line in enumerate(file, 1):
-                    yield LogEntry(raw_line=line, line_number=line_num)
-            # returns a list of LogEntry objects.
+            with self._open() as file:
+                mm = self._map(file)
+                if mm is None: # Streams in binary mode, so lines are never decoded.
+                    for line_num, line in enumerate(file, 1):
+                        newline = len(line) - 1 if line.endswith(b"\n") else len(line)
+                        yield line_num, line[:line_end(line, 0, newline)]
+                    return
+                
+                with mm:
+                    size = len(mm)
+                    pos = 0
+                    line_num = 0
+                    while pos < size:
+                        newline = mm.find(b'\n', pos)
+                        if newline == -1: # Last line has no trailing newline.
+                            newline = size
+                        line_num += 1
+                        yield line_num, mm[pos:line_end(mm, pos, newline)]
+                        pos = newline + 1
+        except PermissionError: # Already describes the file, raised when it is opened.
+            raise
         except Exception as e: # Catches all exceptions during runtime.
             raise IOError(f"An error occured when reading file: {self.file_path}:\n{e}")
         
 class LogFilter:
     """
-    Applies filters to LogEntry objects.
+    Applies filters to raw log lines (bytes).
     """
+    # Below this many keywords the lowered substring tests beat the multi-pattern matchers.
+    MANY_KEYWORDS = 8
+    
+    # Above this many Hyperscan matches per line the match callbacks cost more than the lowered search.
+    HYPERSCAN_MATCHES_PER_LINE = 0.25
+    # Above this many keyword finds per line, one alternation search over the lowered chunk wins.
+    KEYWORD_MATCHES_PER_LINE = 1
+    
     def __init__(self, keywords: list[str] = None):
-        # Ensure all keywords are lowercase to ensure they are read
-        self.keywords = [k.lower() for k in keywords] if keywords else []
+        self.keywords = list(keywords) if keywords else []
+        self._database = None
+        
+        # A line never contains a newline, so a keyword with one matches nothing and is not searched for.
+        searched = [k for k in self.keywords if '\n' not in k]
+        
+        # Lines are matched as bytes by lowering them and testing each lowered keyword with `in`,
+        # which measures faster than an IGNORECASE search. Only ASCII letters are folded.
+        self._lowered = [k.encode('utf-8').lower() for k in searched]
+        
+        # bytes.lower() leaves other letters alone, so keywords such as "ÉCHEC" are matched by decoding
+        # and casefolding each line instead.
+        self._folded = None
+        if not all(k.isascii() for k in searched):
+            self._folded = [k.casefold() for k in searched]
+        
+        # A keyword ending in a carriage return must not match the one dropped from a CRLF line ending,
+        # which the chunk searches cannot tell apart, so such keywords are also tested a line at a time.
+        # Every matcher below is then skipped.
+        self._line_by_line = self._folded is not None or any(k.endswith('\r') for k in searched)
+        
+        # No keywords, or an empty one which is in every line, filters nothing.
+        self.matches_everything = not self.keywords or not all(self._lowered)
+        
+        # Case sensitive, as it only ever searches lowered text. The tail takes the rest of the
+        # line so each search resumes on the next one.
+        self._pattern = None
+        if len(self._lowered) > 1:
+            self._pattern = re.compile(b"(?:" + b"|".join(map(re.escape, self._lowered)) + b")[^\n]*")
+        self._dense = False
+        
+        # Flat transition table for the compiled scanner, only built when it is available.
+        self.scan_table = None
+        if _filter is not None and searched and not self._line_by_line:
+            self.scan_table = build_scan_table(searched)
+        
+        # An empty keyword matches every line without needing a multi-pattern matcher.
+        many_keywords = len(searched) >= self.MANY_KEYWORDS and all(searched) and not self._line_by_line
+        
+        # The compiled scanner takes priority, so the database is only compiled when it is missing.
+        if hyperscan is not None and many_keywords and self.scan_table is None:
+            self._database = hyperscan.Database()
+            self._database.compile(
+                expressions=[re.escape(k.encode('utf-8')) for k in searched],
+                ids=list(range(len(searched))),
+                elements=len(searched),
+                flags=[hyperscan.HS_FLAG_CASELESS] * len(searched),
+            )
         
     def __repr__(self):
         return f"LogFilter(keywords={self.keywords})"
         
-    def matches(self, log_entry: LogEntry) -> bool:
+    def find_lines(self, chunk: bytes) -> list[int]:
+        """
+        Returns the start offsets of the lines in a chunk of whole lines that contain a keyword, in order.
+        Not used when matches_everything is set.
+        """
+        if not self._lowered: # Every keyword contains a newline.
+            return []
+        if self._line_by_line:
+            return self._line_by_line_starts(chunk)
+        if self.scan_table is not None:
+            return _scan_line_starts(chunk, *self.scan_table)
+        if self._database is not None:
+            return self._hyperscan_line_starts(chunk)
+        return self._lowered_line_starts(chunk)
+    
+    def _lowered_line_starts(self, chunk: bytes) -> list[int]:
+        """
+        Returns the start offsets of the matching lines in chunk by searching a lowered copy.
+        The chunk is lowered once and each keyword is found with bytes.find, which measures
+        faster than an IGNORECASE alternation or a per line loop while matches are sparse.
+        Once a chunk needs more than KEYWORD_MATCHES_PER_LINE finds the rest of the file is
+        searched with the lowered alternation instead.
+        """
+        lowered = chunk.lower()
+        if self._pattern is None:
+            return _keyword_line_starts(lowered, self._lowered[0])
+        
+        if not self._dense:
+            budget = lowered.count(b'\n') * self.KEYWORD_MATCHES_PER_LINE + 1
+            starts = set()
+            for keyword in self._lowered:
+                found = _keyword_line_starts(lowered, keyword, budget)
+                if found is None:
+                    self._dense = True
+                    break
+                budget -= len(found)
+                starts.update(found)
+            else:
+                return sorted(starts)
+        
+        return [lowered.rfind(b'\n', 0, match.start()) + 1 for match in self._pattern.finditer(lowered)]
+    
+    def _line_by_line_starts(self, chunk: bytes) -> list[int]:
+        """
+        Returns the start offsets of the matching lines in chunk, cutting out each line as read_lines does and testing it with matches.
+        """
+        starts = []
+        pos = 0
+        for line in chunk.split(b'\n'):
+            if self.matches(line[:line_end(line, 0, len(line))]):
+                starts.append(pos)
+            pos += len(line) + 1
+        return starts
+    
+    def _matches_folded(self, raw_line: bytes) -> bool:
+        """
+        Checks if a line contains a keyword, comparing casefolded text so non-ASCII letters fold too.
+        """
+        line = raw_line.decode('utf-8', errors='ignore').casefold()
+        for keyword in self._folded:
+            if keyword in line:
+                return True
+        return False
+    
+    def _hyperscan_line_starts(self, chunk: bytes) -> list[int]:
+        """
+        Returns the start offsets of the matching lines in chunk with one Hyperscan block scan.
+        Matches arrive in order of their end offset, so later matches on an already found line are skipped.
+        Every match costs a Python callback, so chunks with more matches than HYPERSCAN_MATCHES_PER_LINE
+        allows are handed to the lowered search instead.
+        """
+        match_ends = []
+        limit = chunk.count(b'\n') * self.HYPERSCAN_MATCHES_PER_LINE + 1
+        
+        def collect(pattern_id, start, end, flags, context):
+            match_ends.append(end)
+            return len(match_ends) >= limit # Returning True ends the scan.
+        
+        try:
+            self._database.scan(chunk, match_event_handler=collect)
+        except hyperscan.ScanTerminated:
+            return self._lowered_line_starts(chunk)
+        
+        starts = []
+        line_stop = -1 # Newline ending the last line found.
+        for end in match_ends:
+            if end <= line_stop:
+                continue
+            starts.append(chunk.rfind(b'\n', 0, end) + 1)
+            line_stop = chunk.find(b'\n', end)
+            if line_stop == -1: # Last line has no trailing newline.
+                break
+        return starts
+    
+    def count_lines(self, chunk: bytes) -> int:
+        """
+        Counts the lines in a chunk of whole lines that contain a keyword.
         """
-        Checks if a log entry matches specified keywords.
-        Returns true is keywords are empty (no filtering) or if any keywords match else returns false.
+        if self.matches_everything:
+            return chunk_line_count(chunk)
+        if self.scan_table is not None:
+            return _filter.count(chunk, 0, len(chunk), *self.scan_table)
+        return len(self.find_lines(chunk))
+    
+    def matches(self, raw_line: bytes) -> bool:
         """
-        if not self.keywords:
+        Checks if a line matches specified keywords.
+        Returns true if keywords are empty (no filtering) or if any keywords match else returns false.
+        """
+        if self.matches_everything:
             return True
-            
-        for keyword in self.keywords:
-            if keyword in log_entry.raw_line.lower():
+        
+        if self._folded is not None:
+            return self._matches_folded(raw_line)
+        
+        if self._database is not None:
+            try: # The scan is stopped at the first match, which Hyperscan reports as ScanTerminated.
+                self._database.scan(raw_line, match_event_handler=_stop_at_first_match)
+            except hyperscan.ScanTerminated:
+                return True
+            return False
+        
+        line = raw_line.lower()
+        for keyword in self._lowered:
+            if keyword in line:
                 return True
         return False
     
+class LogWriter:
+    """
+    Responsible only for writing formatted log lines to a binary stream.
+    Every piece of a line is appended straight into one reused buffer, which is written out once enough bytes are pending.
+    """
+    def __init__(self, output_stream, buffer_size: int = 64 * 1024):
+        self.output_stream = output_stream
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._prefix = Colours.DIM_B + b" "
+        self._separator = b" :: "
+        self._suffix = Colours.RESET_B + b"\n"
+        
+    def __repr__(self):
+        return f"LogWriter(output_stream={self.output_stream})"
+    
+    def write(self, entry: LogEntry):
+        """
+        Adds a dimmed entry to the buffer, writing the buffer out when it is full.
+        """
+        self.write_line(entry.line_number, entry.raw_line)
+    
+    def write_line(self, line_number: int, raw_line):
+        """
+        Adds a dimmed line to the buffer without building a LogEntry for it.
+        raw_line can be any bytes-like object, such as a slice of the mapped file.
+        """
+        buffer = self._buffer
+        buffer += self._prefix
+        buffer += b"%d" % line_number
+        buffer += self._separator
+        buffer += raw_line
+        buffer += self._suffix
+        if len(buffer) >= self.buffer_size:
+            self.output_stream.write(self._buffer)
+            self._buffer.clear()
+            
+    def flush(self):
+        """
+        Writes out anything still buffered and flushes the stream.
+        """
+        if self._buffer:
+            self.output_stream.write(self._buffer)
+            self._buffer.clear()
+        self.output_stream.flush()
+    
     
     
 class LogAnalyser:
     """
     Main class that orchestrates reading and filtering log entries.
     """
+    # Count only scans of files at least this large are split across worker processes.
+    PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+    
+    # Formatted entries are buffered and written out once this many bytes are pending.
+    WRITE_BUFFER_SIZE = 64 * 1024
+    
     def __init__(self, file_path: str, keywords: list[str] = None):
         self.log_reader = LogReader(file_path)
         self.log_filter = LogFilter(keywords)
@@ -124,18 +441,96 @@ class LogAnalyser:
     def analyse(self):
         """
         Reads the log file and applies filters.
-        Yields a list of filtered LogEntry objects.
+        Yields a list of filtered LogEntry objects, built only for lines that match.
         """
+        matches = self.log_filter.matches
         try:
-            for entry in self.log_reader.read_lines():
+            for line_number, raw_line in self.log_reader.read_lines():
                 self.total_lines += 1
-                if self.log_filter.matches(entry):
+                if matches(raw_line):
                     self.filtered_lines += 1
-                    yield entry
+                    yield LogEntry(raw_line=raw_line, line_number=line_number)
+        except Exception as e:
+            print(f"Error during log analysis: {e}", file=sys.stderr)
+            sys.exit(1)
+            
+    def run(self, output_stream=None, count_only: bool = False):
+        """
+        Reads, filters and writes matching entries in a single loop.
+        The file is searched a chunk of whole lines at a time and only matching lines are formatted.
+        Output goes to a binary stream (stdout by default) in large buffered writes.
+        In count only mode nothing is formatted or written, only the totals are updated.
+        """
+        if output_stream is None:
+            output_stream = sys.stdout.buffer
+        writer = LogWriter(output_stream, self.WRITE_BUFFER_SIZE)
+        
+        try:
+            size = self.log_reader.check_file()
+            
+            if count_only: # Nothing is printed, so lines never need to be visited one by one.
+                workers = os.cpu_count() or 1
+                if size >= self.PARALLEL_MIN_SIZE and workers > 1:
+                    total, filtered = self._count_parallel(size, workers)
+                else:
+                    total, filtered = count_chunks(self.log_filter, self.log_reader.read_chunks())
+                self.total_lines += total
+                self.filtered_lines += filtered
+                return
+            
+            for chunk in self.log_reader.read_chunks():
+                self._write_chunk(chunk, writer)
+            writer.flush()
         except Exception as e:
             print(f"Error during log analysis: {e}", file=sys.stderr)
             sys.exit(1)
             
+    def _write_chunk(self, chunk: bytes, writer: LogWriter):
+        """
+        Writes the matching lines of a chunk of whole lines and adds them to the totals.
+        Only matching lines are visited; line numbers come from counting the newlines skipped over.
+        """
+        size = len(chunk)
+        line_number = self.total_lines
+        
+        # Lines are written from a view of the chunk, so they are never copied out of it.
+        with memoryview(chunk) as view:
+            if self.log_filter.matches_everything: # Every line is written, so walk them in order.
+                pos = 0
+                while pos < size:
+                    newline = chunk.find(b'\n', pos)
+                    if newline == -1: # Last line has no trailing newline.
+                        newline = size
+                    line_number += 1
+                    writer.write_line(line_number, view[pos:line_end(chunk, pos, newline)])
+                    pos = newline + 1
+                self.filtered_lines += line_number - self.total_lines
+            else:
+                counted = 0 # Start of the first line not yet counted.
+                for start in self.log_filter.find_lines(chunk):
+                    line_number += chunk.count(b'\n', counted, start) + 1
+                    newline = chunk.find(b'\n', start)
+                    if newline == -1: # Last line has no trailing newline.
+                        newline = size
+                    writer.write_line(line_number, view[start:line_end(chunk, start, newline)])
+                    self.filtered_lines += 1
+                    counted = newline + 1
+        
+        self.total_lines += chunk_line_count(chunk)
+    
+    def _count_parallel(self, size: int, workers: int) -> tuple[int, int]:
+        """
+        Splits the file into one region per worker and sums the line and match counts.
+        Each worker maps the file and builds its filter itself, so only the keywords and offsets are sent between processes.
+        """
+        step = -(-size // workers) # Ceiling division so the regions cover the whole file.
+        regions = [(self.log_reader.file_path, self.log_filter.keywords, start, min(start + step, size))
+                   for start in range(0, size, step)]
+        
+        with Pool(workers) as pool:
+            counts = pool.starmap(_count_file_region, regions)
+        return sum(c[0] for c in counts), sum(c[1] for c in counts)
+    
     def get_summary(self):
         """
         Returns a summary of the log analysis.
@@ -148,12 +543,174 @@ class LogAnalyser:
             "has_filters": bool(self.log_filter.keywords)  
         }
 
+# Files are processed in chunks of whole lines of about this size, so large maps are never copied whole.
+CHUNK_SIZE = 1024 * 1024
+
+def iter_chunks(buffer, start: int, end: int, chunk_size: int = CHUNK_SIZE):
+    """
+    Generates buffer[start:end] as bytes chunks that each end on a line boundary.
+    A line longer than chunk_size is kept whole in a larger chunk.
+    """
+    pos = start
+    while pos < end:
+        stop = pos + chunk_size
+        if stop >= end:
+            stop = end
+        else:
+            newline = buffer.rfind(b'\n', pos, stop)
+            if newline == -1: # A single line fills the chunk, so extend to its end.
+                newline = buffer.find(b'\n', stop, end)
+            stop = end if newline == -1 else newline + 1
+        yield buffer[pos:stop]
+        pos = stop
+
+def stream_chunks(file, chunk_size: int = CHUNK_SIZE):
+    """
+    Generates an open binary file as bytes chunks that each end on a line boundary, for files that cannot be mapped.
+    The partial line at the end of each read is carried over to the next chunk.
+    """
+    pending = []
+    while True:
+        block = file.read(chunk_size)
+        if not block:
+            break
+        newline = block.rfind(b'\n')
+        if newline == -1: # No line ends in this block, so keep reading.
+            pending.append(block)
+            continue
+        pending.append(block[:newline + 1])
+        yield b"".join(pending)
+        pending = [block[newline + 1:]]
+    
+    tail = b"".join(pending)
+    if tail: # Last line has no trailing newline.
+        yield tail
+
+def chunk_line_count(chunk: bytes) -> int:
+    """
+    Counts the lines in a chunk, including a final line with no trailing newline.
+    """
+    return chunk.count(b'\n') + (not chunk.endswith(b'\n') and len(chunk) > 0)
+
+def _keyword_line_starts(text: bytes, keyword: bytes, limit: float = None) -> list[int]:
+    """
+    Returns the start offsets of the lines in text containing keyword, resuming after each such line.
+    Returns None instead once more than limit lines are found.
+    """
+    starts = []
+    found = text.find(keyword)
+    while found != -1:
+        if limit is not None and len(starts) > limit:
+            return None
+        starts.append(text.rfind(b'\n', 0, found) + 1)
+        newline = text.find(b'\n', found)
+        if newline == -1:
+            break
+        found = text.find(keyword, newline + 1)
+    return starts
+
+# Matching lines collected per call into the compiled scanner.
+SCAN_BATCH_LINES = 4096
+
+def _scan_line_starts(chunk: bytes, transitions: array, accepting: array) -> list[int]:
+    """
+    Returns the start offsets of the matching lines in chunk using the compiled _filter scanner.
+    The scanner fills a batch of line starts per call.
+    """
+    found_lines = array('q', [0]) * SCAN_BATCH_LINES
+    starts = []
+    size = len(chunk)
+    pos = 0
+    while pos < size:
+        pos, found = _filter.scan(chunk, pos, size, transitions, accepting, found_lines)
+        starts.extend(found_lines[:found])
+    return starts
+
+def line_end(buffer, start: int, newline: int) -> int:
+    """
+    Returns where the line ending at newline stops, leaving out a Windows style carriage return.
+    """
+    return newline - 1 if newline > start and buffer[newline - 1] == 13 else newline # b"\r"
+
+def _stop_at_first_match(*match) -> bool:
+    """Hyperscan match handler, returning True to end the scan."""
+    return True
+
+def _fold_case(byte: int) -> int:
+    """Maps an ASCII upper case byte to lower case, leaving every other byte alone."""
+    return byte + 32 if 65 <= byte <= 90 else byte
+
+def build_scan_table(keywords: list[str]) -> tuple[array, array]:
+    """
+    Builds the flat Aho-Corasick table used by the _filter scanner.
+    Keywords are matched ignoring ASCII case, like the lowered search, so they must all be ASCII.
+    Returns the transitions (256 per state) and whether each state completes a keyword.
+    """
+    goto = [{}]
+    accepting = [False]
+    for keyword in keywords:
+        state = 0
+        for byte in keyword.encode('utf-8').lower():
+            if byte not in goto[state]:
+                goto[state][byte] = len(goto)
+                goto.append({})
+                accepting.append(False)
+            state = goto[state][byte]
+        accepting[state] = True
+    
+    # Breadth first so each state's failure row is complete before its children need it.
+    transitions = array('I', [0]) * (256 * len(goto))
+    fail = [0] * len(goto)
+    queue = deque([0])
+    while queue:
+        state = queue.popleft()
+        accepting[state] = accepting[state] or accepting[fail[state]]
+        for byte in range(256):
+            child = goto[state].get(_fold_case(byte))
+            if child is None:
+                transitions[state * 256 + byte] = transitions[fail[state] * 256 + byte] if state else 0
+                continue
+            
+            transitions[state * 256 + byte] = child
+            if byte == _fold_case(byte): # Upper case bytes share the child, so only queue it once.
+                fail[child] = transitions[fail[state] * 256 + byte] if state else 0
+                queue.append(child)
+    
+    return transitions, array('B', accepting)
+
+def count_chunks(log_filter: LogFilter, chunks) -> tuple[int, int]:
+    """
+    Counts the total and matching lines in chunks of whole lines.
+    """
+    total = filtered = 0
+    for chunk in chunks:
+        total += chunk_line_count(chunk)
+        filtered += log_filter.count_lines(chunk)
+    return total, filtered
+
+def _count_file_region(file_path: str, keywords: list[str], start: int, end: int) -> tuple[int, int]:
+    """
+    Worker process entry point for a parallel count.
+    A region owns every line that starts inside it, so both bounds are moved forward to the next line start.
+    """
+    def line_start(buffer, offset):
+        if offset == 0 or offset >= len(buffer) or buffer[offset - 1:offset] == b'\n':
+            return min(offset, len(buffer))
+        newline = buffer.find(b'\n', offset)
+        return len(buffer) if newline == -1 else newline + 1
+    
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return count_chunks(LogFilter(keywords), iter_chunks(mm, line_start(mm, start), line_start(mm, end)))
+
 def clear_terminal():
-    """Clears the terminal screen based on the operating system."""
-    if sys.platform.startswith('win'): # Windows
+    """Clears the terminal screen, writing the ANSI sequence directly where it is understood."""
+    if sys.platform.startswith('win'): # Windows, older consoles ignore ANSI sequences
         os.system('cls')
-    else: # Linux, macOS, and other POSIX systems
+    elif not sys.stdout.isatty(): # Not a terminal, leave it to the system's clear command
         os.system('clear')
+    else: # Linux, macOS, and other POSIX terminals, no shell needs to be started
+        sys.stdout.write(Colours.CLEAR_SCREEN)
+        sys.stdout.flush()
 
 def main():
     arg_parser = argparse.ArgumentParser(
@@ -176,7 +733,7 @@ def main():
     
     # Create an instance of log analyser with provided arguments
     log_analyser = LogAnalyser(file_path=args.file, keywords=args.keywords)
-    line_break = Colours.apply(f"\n{"-" * 50}\n\n", Colours.DIM)
+    line_break = Colours.apply(f"\n{'-' * 50}\n\n", Colours.DIM)
     
     clear_terminal()  # Clear the terminal for a fresh start
 
@@ -193,9 +750,8 @@ def main():
 
     print(line_break + Colours.apply("Starting log analysis...", Colours.YELLOW))
     
-    for entry in log_analyser.analyse():
-        if not args.count_only:
-            print(Colours.apply(entry, Colours.DIM))
+    sys.stdout.flush() # Entries are written to the underlying binary stream.
+    log_analyser.run(sys.stdout.buffer, count_only=args.count_only)
             
     summary = log_analyser.get_summary() # Get the summary of the analysis
     
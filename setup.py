@@ -0,0 +1,22 @@
+"""
+Builds the optional _filter extension used by log_analyser for keyword scanning.
+
+    python setup.py build_ext --inplace
+
+log_analyser works without it, falling back to searching lowered chunks.
+"""
+import sys
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+# MSVC does not understand the GCC/Clang optimisation flags.
+compile_args = [] if sys.platform.startswith('win') else ["-O3", "-march=native"]
+
+setup(
+    name="log-file-analyser-filter",
+    ext_modules=cythonize(
+        [Extension("_filter", ["_filter.pyx"], extra_compile_args=compile_args)],
+        language_level=3,
+    ),
+)